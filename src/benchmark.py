@@ -0,0 +1,188 @@
+"""Memory benchmark for the read/merge/write pipeline."""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tracemalloc
+from localization import (
+    Localization, DAT1, Entry, SectionInfo, CLASS_TO_TAG
+)
+from dualsub import make_multisub
+
+try:
+    # resource is not available on Windows
+    import resource
+except ImportError:
+    resource = None
+
+# Budgets of peak and retained memory per entry (bytes).
+# They are tuned for generated tables with the default number of entries,
+# so they are checked for real files only when --budget is specified.
+# The benchmark fails when a phase exceeds its budget.
+PEAK_BUDGETS = {
+    "read": 700,
+    "get_json": 41,
+    "make_multisub": 262,
+    "import_json": 1,
+    "write": 634,
+}
+RETAINED_BUDGETS = {
+    "read": 520,
+    "get_json": 28,
+    "make_multisub": 261,
+    "import_json": 1,
+    "write": 229,
+}
+
+# sorted indexes are stored as uint16
+MAX_ENTRIES = 65535
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("file", nargs="*", type=str,
+                        help=".localization (generates tables when omitted. the first one is the main language.)")
+    parser.add_argument("--entries", type=int, default=2000, help="number of entries of generated tables")
+    parser.add_argument("--no_check", action="store_true", help="don't check budgets")
+    parser.add_argument("--budget", action="store_true", help="check budgets for real files as well")
+    args = parser.parse_args()
+    if args.entries <= 0 or args.entries > MAX_ENTRIES:
+        parser.error(f"--entries should be in 1..{MAX_ENTRIES}. ({args.entries})")
+    return args
+
+
+def make_localization(entry_count: int, lang: int) -> Localization:
+    # make a localization asset that has subtitle-like entries
+    data = DAT1()
+    data.section_info_list = []
+    for tag in CLASS_TO_TAG.values():
+        section = SectionInfo()
+        section.tag = tag
+        data.section_info_list.append(section)
+    data.unk = b"\x00" * 36
+
+    keys = []
+    key_offset = 0
+    data.entries = []
+    for i in range(entry_count):
+        e = Entry()
+        e.key = f"VO_SCENE{i // 1000:03d}_LINE_{i % 1000:03d}"
+        e.key_offset = key_offset
+        key = e.key.encode("utf-8") + b"\x00"
+        keys.append(key)
+        key_offset += len(key)
+        e.value = (f"<ts=&quot;0.0;1.5&quot;>lang{lang} line {i}"
+                   f"<ts=&quot;1.5;{3.0 + lang % 2}&quot;>second page of line {i}")
+        if lang % 2 == 0:
+            e.value += f"<ts=&quot;{3.0 + lang % 2};5.0&quot;>third page"
+        e.value_offset = 0
+        data.entries.append(e)
+    data.keys = b"".join(keys)
+    data.key_hashes = list(range(entry_count))
+    data.sorted_key_hashes = list(range(entry_count))
+    data.sorted_indexes = list(range(entry_count))
+    data.unknown_ints = [0] * entry_count
+    data.entry_count = entry_count
+
+    loc = Localization()
+    loc.unk = b"\x00" * 28
+    loc.data = data
+    return loc
+
+
+def to_bytes(loc: Localization) -> bytes:
+    with io.BytesIO() as f:
+        loc.write(f)
+        return f.getvalue()
+
+
+def get_max_rss() -> int:
+    if resource is None:
+        return -1
+    # KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class MemoryBenchmark:
+    def __init__(self, entry_count: int):
+        self.entry_count = entry_count
+        self.results = []
+
+    def run_phase(self, name: str, func, *args):
+        gc.collect()
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        ret = func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.results.append((name, peak - start, current - start))
+        return ret
+
+    def print(self):
+        print(f"entries: {self.entry_count}")
+        print(f"{'phase':<14}{'peak':>12}{'retained':>12}{'peak/entry':>12}{'ret/entry':>12}")
+        for name, peak, retained in self.results:
+            print(f"{name:<14}{peak:>12}{retained:>12}"
+                  f"{peak // self.entry_count:>12}{retained // self.entry_count:>12}")
+        max_rss = get_max_rss()
+        if max_rss >= 0:
+            print(f"max rss: {max_rss} KiB")
+
+    def check(self):
+        for name, peak, retained in self.results:
+            for kind, size, budget in [("peak", peak, PEAK_BUDGETS[name]),
+                                       ("retained", retained, RETAINED_BUDGETS[name])]:
+                per_entry = size / self.entry_count
+                if per_entry > budget:
+                    raise RuntimeError(f"Memory budget exceeded. (phase: {name}, "
+                                       f"{kind}/entry: {per_entry:.1f}, budget: {budget})")
+        print("All phases are within the memory budgets.")
+
+
+def read_loc(data: bytes) -> Localization:
+    loc = Localization()
+    with io.BytesIO(data) as f:
+        loc.read(f)
+    return loc
+
+
+def run(main_data: bytes, sub_data: bytes, check: bool = True):
+    sub_j = read_loc(sub_data).get_json()
+
+    loc = read_loc(main_data)
+    bench = MemoryBenchmark(len(loc.data.entries))
+    del loc
+    gc.collect()
+
+    loc = bench.run_phase("read", read_loc, main_data)
+    main_j = bench.run_phase("get_json", loc.get_json)
+    main_j = bench.run_phase("make_multisub", make_multisub, main_j, [sub_j])
+    # DAT1.import_json prints its progress.
+    # devnull is opened here so that its buffer is not counted in the phase.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        bench.run_phase("import_json", loc.import_json, main_j)
+    bench.run_phase("write", to_bytes, loc)
+
+    bench.print()
+    if check:
+        bench.check()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    check = not args.no_check
+    if len(args.file) == 0:
+        main_data = to_bytes(make_localization(args.entries, 0))
+        sub_data = to_bytes(make_localization(args.entries, 1))
+    else:
+        with io.open(args.file[0], "rb") as f:
+            main_data = f.read()
+        if len(args.file) > 1:
+            with io.open(args.file[1], "rb") as f:
+                sub_data = f.read()
+        else:
+            sub_data = main_data
+        check = check and args.budget
+    run(main_data, sub_data, check=check)
@@ -83,63 +83,61 @@ def join_pages(split, split2, len_diff):
     return split
 
 
-def concat_subtitle(str1: str, str2: str):
+def concat_subtitles(strings: list[str]) -> str:
     # The ts tag works like pagenation. so, we should split strings by the tags first.
-    split1 = split_by_ts_tag(str1)
-    split2 = split_by_ts_tag(str2)
-
-    if len(split1) == 1 and len(split2) == 1:
-        # just concatenate them with a linefeed because there is no ts tag.
-        return split1[0] + "<br>" + split2[0]
-
-    # add a fake ts tag if it doesn't have
-    if len(split1) == 1 and len(split2) > 1 and not split1[0].startswith("<name"):
-        split1 = ["", split2[1]] + split1
-    if len(split2) == 1 and len(split1) > 1 and not split2[0].startswith("<name"):
-        split2 = ["", split1[1]] + split2
-
-    len_diff = len(split1) - len(split2)
-    if len_diff % 2 != 0 or (split1[0] != "" and not split1[0].startswith("<name")):
-        # error
-        print(len(split1))
-        print(split1)
-        print(len(split2))
-        print(split2)
-        raise RuntimeError("Unknown pattern.")
-
-    # split1[0] and split2[0] should be the name tags or empty strings.
+    # Each string is tokenized only once, even if we merge three or more languages.
+    splits = [split_by_ts_tag(string) for string in strings]
+
+    if all(len(split) == 1 for split in splits):
+        # just concatenate them with linefeeds because there is no ts tag.
+        return "<br>".join(split[0] for split in splits)
+
+    # add a fake ts tag if it doesn't have.
+    # sub languages can be bare name tags. they will be concatenated as page text.
+    fake_tag = next(split[1] for split in splits if len(split) > 1)
+    for i, split in enumerate(splits):
+        if len(split) == 1 and (i > 0 or not split[0].startswith("<name")):
+            splits[i] = ["", fake_tag] + split
+
+    if len(splits[0]) == 1 or (splits[0][0] != "" and not splits[0][0].startswith("<name")):
+        raise RuntimeError(f"Unknown pattern. ({[(len(split), split) for split in splits]})")
+
+    # splits[*][0] should be the name tags or empty strings.
     # so, we don't need to concatenate them.
-    res = split1[0]
-    split1 = split1[1:]
-    split2 = split2[1:]
+    res = splits[0][0]
+    splits = [split[1:] for split in splits]
 
     # join pages if they have different numbers of ts tags.
-    if (len_diff > 0):
-        split1 = join_pages(split1, split2, len_diff)
-    if (len_diff < 0):
-        split2 = join_pages(split2, split1, -len_diff)
+    # all strings are aligned to the one that has the fewest pages.
+    min_split = min(splits, key=len)
+    for i, split in enumerate(splits):
+        len_diff = len(split) - len(min_split)
+        if len_diff > 0:
+            splits[i] = join_pages(split, min_split, len_diff)
 
     # concatenate each page
-    for i in range(0, len(split1), 2):
-        res += split1[i]
-        if split1[i + 1] == "":
-            res += split2[i + 1]
-        elif split2[i + 1] == "":
-            res += split1[i + 1]
-        else:
-            res += split1[i + 1] + "<br>" + split2[i + 1]
+    for i in range(0, len(min_split), 2):
+        res += splits[0][i]
+        res += "<br>".join(split[i + 1] for split in splits if split[i + 1] != "")
     return res
 
 
-def make_dualsub(main_j: dict, sub_j: dict):
+def concat_subtitle(str1: str, str2: str):
+    return concat_subtitles([str1, str2])
+
+
+def make_multisub(main_j: dict, sub_j_list: list[dict]):
     # remove non-subtitile strings from json
     main_j = filter_subtitles(main_j)
-    sub_j = filter_subtitles(sub_j)
-
-    for key, value in sub_j.items():
-        if key in main_j and value != "":
-            main_val = main_j[key]
-            if main_val != "":
-                # when they are not empty strings
-                main_j[key] = concat_subtitle(main_val, value)
+    sub_j_list = [filter_subtitles(sub_j) for sub_j in sub_j_list]
+
+    for key, main_val in main_j.items():
+        values = [main_val] + [sub_j[key] for sub_j in sub_j_list if sub_j.get(key, "") != ""]
+        if len(values) > 1:
+            # when they are not empty strings
+            main_j[key] = concat_subtitles(values)
     return main_j
+
+
+def make_dualsub(main_j: dict, sub_j: dict):
+    return make_multisub(main_j, [sub_j])
@@ -1,6 +1,16 @@
 import io
+import json
 import struct
 
+try:
+    # optional fast json backend
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_STYLES = ["pretty", "compact"]
+JSON_CHUNK_SIZE = 1 << 20
+
 
 def get_size(f: io.BufferedReader):
     pos = f.tell()
@@ -100,3 +110,41 @@ def compare(file1: str, file2: str):
         i += 1
 
     raise RuntimeError(f"Not the same :{i} ({file1})")
+
+
+def load_json(file: str) -> dict:
+    if orjson is not None:
+        with open(file, "rb") as f:
+            return orjson.loads(f.read())
+    with open(file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(j: dict, file: str, style: str = "pretty"):
+    if style not in JSON_STYLES:
+        raise RuntimeError(f"Unknown json style. ({style})")
+
+    if style == "compact":
+        if orjson is not None:
+            with open(file, "wb") as f:
+                f.write(orjson.dumps(j))
+            return
+        # one-shot encoding uses the C encoder
+        with open(file, "w", encoding="utf-8") as f:
+            f.write(json.dumps(j, ensure_ascii=False, separators=(",", ":")))
+        return
+
+    # pretty style should be the same as json.dump(j, f, indent=4, ensure_ascii=False).
+    # we join small chunks from the encoder and write them in large blocks.
+    encoder = json.JSONEncoder(indent=4, ensure_ascii=False)
+    with open(file, "w", encoding="utf-8") as f:
+        buf = []
+        size = 0
+        for chunk in encoder.iterencode(j):
+            buf.append(chunk)
+            size += len(chunk)
+            if size >= JSON_CHUNK_SIZE:
+                f.write("".join(buf))
+                buf = []
+                size = 0
+        f.write("".join(buf))
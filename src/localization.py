@@ -1,8 +1,10 @@
 """Localization assets (*.localization)."""
 
 import ctypes as c
+import hashlib
 import io
-from typing import Final
+import os
+from typing import Final, Optional
 from io_util import (
     get_size,
     read_uint32, read_uint32_array, read_uint16_array,
@@ -27,6 +29,8 @@ CLASS_TO_TAG = {v: k for k, v in TAG_TO_CLASS.items()}
 
 
 class Entry:
+    __slots__ = ("key_offset", "value_offset", "key", "value")
+
     def read_key_offset(self, f: io.BufferedReader):
         self.key_offset = read_uint32(f)
 
@@ -71,6 +75,49 @@ class Entry:
         print(f"  value: {self.value}")
 
 
+class KeyTable:
+    """Keys and key-related sections shared by localization files."""
+    # sections that are usually the same in all languages
+    SHARED_ARRAYS: Final[tuple[str, ...]] = (
+        "key_hashes", "sorted_key_hashes", "sorted_indexes", "unknown_ints"
+    )
+
+    def __init__(self, keys_data: bytes, key_offsets: tuple[int, ...], keys: list[str], data: "DAT1"):
+        self.keys_data = keys_data
+        self.key_offsets = key_offsets
+        self.keys = keys
+        self.arrays = {name: getattr(data, name) for name in KeyTable.SHARED_ARRAYS}
+
+    def share(self, data: "DAT1"):
+        # let the DAT1 refer to the shared objects instead of its own copies
+        data.keys = self.keys_data
+        for e, key_offset, key in zip(data.entries, self.key_offsets, self.keys):
+            e.key_offset = key_offset
+            e.key = key
+        for name, array in self.arrays.items():
+            if getattr(data, name) == array:
+                setattr(data, name, array)
+
+
+class KeyStore:
+    """Interns key tables by hash of KeysDataSection."""
+    def __init__(self):
+        self.tables: dict[bytes, KeyTable] = {}
+
+    def get(self, keys_data: bytes, key_offsets: tuple[int, ...]) -> Optional[KeyTable]:
+        digest = hashlib.sha1(keys_data).digest()
+        table = self.tables.get(digest, None)
+        if table is not None and table.key_offsets == key_offsets:
+            return table
+        return None
+
+    def add(self, keys_data: bytes, key_offsets: tuple[int, ...], keys: list[str], data: "DAT1") -> KeyTable:
+        digest = hashlib.sha1(keys_data).digest()
+        table = KeyTable(keys_data, key_offsets, keys, data)
+        self.tables.setdefault(digest, table)
+        return table
+
+
 class SectionInfo(c.LittleEndianStructure):
     _pack_ = 1
     _fields_ = [
@@ -88,7 +135,7 @@ class SectionInfo(c.LittleEndianStructure):
 class DAT1:
     TAG: Final[bytes] = b"1TAD"
 
-    def read(self, f: io.BufferedReader, parent_tag: bytes):
+    def read(self, f: io.BufferedReader, parent_tag: bytes, key_store: KeyStore = None):
         tag = f.read(4)
         if tag != DAT1.TAG:
             raise RuntimeError("Invalid DAT1 tag.")
@@ -117,7 +164,7 @@ class DAT1:
         self.read_key_offsets(f)
         self.read_value_offsets(f)
         self.read_unknown_ints(f)
-        self.read_keys(f)
+        self.read_keys(f, key_store)
         self.read_values(f)
 
     def get_section_info(self, tag: bytes) -> SectionInfo:
@@ -175,12 +222,24 @@ class DAT1:
         list(map(lambda x: x.read_value_offset(f), self.entries))
         self.check_section_size(f, section)
 
-    def read_keys(self, f: io.BufferedReader):
+    def read_keys(self, f: io.BufferedReader, key_store: KeyStore = None):
         section = self.get_section_info(CLASS_TO_TAG["KeysDataSection"])
         f.seek(section.offset)
         self.keys = f.read(section.size)
-        f.seek(section.offset)
-        list(map(lambda x: x.read_key(f), self.entries))
+        if key_store is None:
+            f.seek(section.offset)
+            list(map(lambda x: x.read_key(f), self.entries))
+            return
+
+        # reuse decoded keys when another file has the same keys section
+        key_offsets = tuple(e.key_offset for e in self.entries)
+        table = key_store.get(self.keys, key_offsets)
+        if table is None:
+            f.seek(section.offset)
+            list(map(lambda x: x.read_key(f), self.entries))
+            keys = [e.key for e in self.entries]
+            table = key_store.add(self.keys, key_offsets, keys, self)
+        table.share(self)
 
     def read_values(self, f: io.BufferedReader):
         section = self.get_section_info(CLASS_TO_TAG["ValuesDataSection"])
@@ -315,7 +374,7 @@ class DAT1:
 class Localization:
     TAG: Final[bytes] = b"\xAB\xB0\x2B\x12"
 
-    def read(self, f: io.BufferedReader):
+    def read(self, f: io.BufferedReader, key_store: KeyStore = None):
         tag = f.read(4)
         if tag != Localization.TAG:
             raise RuntimeError("Invalid localization tag.")
@@ -329,7 +388,7 @@ class Localization:
         data = f.read(data_size)
         reader = io.BytesIO(data)
         self.data = DAT1()
-        self.data.read(reader, tag)
+        self.data.read(reader, tag, key_store)
         reader.close()
 
     def write(self, f: io.BufferedWriter):
@@ -352,3 +411,39 @@ class Localization:
 
     def get_ext(self):
         return ".localization"
+
+
+class LocalizationSession:
+    """Multiple localization assets (e.g. all languages) that share one key table."""
+    def __init__(self):
+        self.key_store = KeyStore()
+        self.locs: dict[str, Localization] = {}
+
+    def load(self, file: str, name: str = None) -> Localization:
+        if name is None:
+            name = os.path.basename(file)
+        if name in self.locs:
+            raise RuntimeError(f"Localization name is already used in the session. ({name}, {file})")
+        loc = Localization()
+        with io.open(file, "rb") as f:
+            loc.read(f, self.key_store)
+        self.locs[name] = loc
+        return loc
+
+    def get(self, name: str) -> Localization:
+        return self.locs[name]
+
+    def get_names(self) -> list[str]:
+        return list(self.locs.keys())
+
+    def get_keys(self, name: str) -> list[str]:
+        return [e.key for e in self.locs[name].data.entries]
+
+    def get_values(self, name: str) -> list[str]:
+        return [e.value for e in self.locs[name].data.entries]
+
+    def get_json(self, name: str) -> dict:
+        return self.locs[name].get_json()
+
+    def get_key_table_count(self) -> int:
+        return len(self.key_store.tables)
@@ -1,17 +1,18 @@
 import argparse
 import io
-import json
 import os
 from localization import Localization
-from dualsub import make_dualsub
-from io_util import compare
+from dualsub import make_multisub
+from io_util import compare, load_json, save_json, JSON_STYLES
 
 
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("file", type=str, help=".localization")
-    parser.add_argument("json", nargs="?", type=str, help=".json")
+    parser.add_argument("json", nargs="*", type=str, help=".json (merge mode accepts multiple files)")
     parser.add_argument("--mode", type=str, default="extract", help="extract, merge, inject, or validate")
+    parser.add_argument("--json-style", type=str, default="pretty", choices=JSON_STYLES,
+                        help="format of output json files (pretty or compact)")
     args = parser.parse_args()
     return args
 
@@ -24,21 +25,19 @@ def add_new_to_filename(file, ext):
     return new_file
 
 
-def extract_json_from_loc(file: str) -> str:
+def extract_json_from_loc(file: str, json_style: str = "pretty") -> str:
     loc = Localization()
     with io.open(file, "rb") as f:
         loc.read(f)
     j = loc.get_json()
 
     new_file = file + ".json"
-    with open(new_file, 'w', encoding='utf-8') as f:
-        json.dump(j, f, indent=4, ensure_ascii=False)
+    save_json(j, new_file, json_style)
     return new_file
 
 
 def inject_json_to_loc(file: str, json_file: str) -> str:
-    with open(json_file, encoding='utf-8') as f:
-        j = json.load(f)
+    j = load_json(json_file)
 
     loc = Localization()
     with io.open(file, "rb") as f:
@@ -51,18 +50,14 @@ def inject_json_to_loc(file: str, json_file: str) -> str:
     return new_file
 
 
-def merge_subtitles(file: str, json_file: str) -> str:
-    with open(file, encoding='utf-8') as f:
-        main_j = json.load(f)
+def merge_subtitles(file: str, json_files: list[str], json_style: str = "pretty") -> str:
+    main_j = load_json(file)
+    sub_j_list = [load_json(json_file) for json_file in json_files]
 
-    with open(json_file, encoding='utf-8') as f:
-        sub_j = json.load(f)
-
-    main_j = make_dualsub(main_j, sub_j)
+    main_j = make_multisub(main_j, sub_j_list)
 
     new_file = add_new_to_filename(file, ".json")
-    with open(new_file, 'w', encoding='utf-8') as f:
-        json.dump(main_j, f, indent=4, ensure_ascii=False)
+    save_json(main_j, new_file, json_style)
     return new_file
 
 
@@ -86,7 +81,12 @@ def has_ext(file, ext):
     return file.split(".")[-1] == ext
 
 
-def main(file, json, mode, strict=True):
+def main(file, json, mode, strict=True, json_style="pretty"):
+    if mode == "merge" and len(json) == 0:
+        raise RuntimeError("Merge mode requires at least one json file.")
+    if mode == "inject" and len(json) != 1:
+        raise RuntimeError(f"Inject mode requires exactly one json file. (got {len(json)})")
+
     if mode == "merge":
         if not has_ext(file, "json"):
             if strict:
@@ -101,13 +101,13 @@ def main(file, json, mode, strict=True):
     print(f"processing {file}...")
     if mode == "extract":
         # convert .localization to .json
-        new_file = extract_json_from_loc(file)
+        new_file = extract_json_from_loc(file, json_style)
     elif mode == "merge":
-        # merge two json files
-        new_file = merge_subtitles(file, json)
+        # merge json files
+        new_file = merge_subtitles(file, json, json_style)
     elif mode == "inject":
         # inject .json into .localization
-        new_file = inject_json_to_loc(file, json)
+        new_file = inject_json_to_loc(file, json[0])
     elif mode == "validate":
         validate(file)
         return
@@ -118,11 +118,11 @@ def main(file, json, mode, strict=True):
 if __name__ == "__main__":
     args = get_args()
     if os.path.isfile(args.file):
-        main(args.file, args.json, args.mode, strict=True)
+        main(args.file, args.json, args.mode, strict=True, json_style=args.json_style)
     elif os.path.isdir(args.file):
         directory = args.file
         for file in os.listdir(directory):
-            main(os.path.join(directory, file), args.json, args.mode, strict=False)
+            main(os.path.join(directory, file), args.json, args.mode, strict=False, json_style=args.json_style)
             print("", end="", flush=True)
     else:
         raise RuntimeError(f"Specified path doesn't exist. ({args.file})")